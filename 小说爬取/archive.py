@@ -0,0 +1,97 @@
+import gzip
+import os
+import posixpath
+import time
+import uuid
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlparse
+
+# 原始网页归档：类WARC格式，每条记录单独gzip压缩后追加到同一文件
+ARCHIVE_NAME = 'raw_pages.warc.gz'
+
+
+class RawArchive:
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.file = open(path, 'ab')
+
+    def write(self, url, html):
+        body = html.encode('utf-8')
+        header = (
+            'WARC/1.0\r\n'
+            'WARC-Type: resource\r\n'
+            f'WARC-Target-URI: {url}\r\n'
+            f"WARC-Date: {time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())}\r\n"
+            f'WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>\r\n'
+            'Content-Type: text/html; charset=utf-8\r\n'
+            f'Content-Length: {len(body)}\r\n'
+            '\r\n'
+        ).encode('utf-8')
+        # 独立的gzip成员，中断时已写入的记录仍可读取
+        self.file.write(gzip.compress(header + body + b'\r\n\r\n'))
+        self.file.flush()
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def book_key(url):
+    # 章节页所在目录视为同一本书，如 /book/120386/53805857.html
+    parsed = urlparse(url)
+    return parsed.hostname, posixpath.dirname(parsed.path)
+
+
+def iter_records(path):
+    with gzip.open(path, 'rb') as f:
+        while True:
+            line = f.readline()
+            if not line:
+                break
+            if not line.startswith(b'WARC/'):
+                continue
+            headers = {}
+            while True:
+                line = f.readline()
+                if not line or line in (b'\r\n', b'\n'):
+                    break
+                key, _, value = line.decode('utf-8').partition(':')
+                headers[key.strip()] = value.strip()
+            body = f.read(int(headers.get('Content-Length', 0)))
+            f.readline()
+            f.readline()
+            yield headers.get('WARC-Target-URI'), body.decode('utf-8', errors='replace')
+
+
+def load_pages(path, book=None):
+    # 同一URL重复抓取时保留首次出现的顺序和最后一次的内容；指定book时只载入这本书的页面
+    pages = {}
+    try:
+        for url, html in iter_records(path):
+            if book is None or book_key(url) == book:
+                pages[url] = html
+    except EOFError:
+        print(f"⚠️ 归档文件末尾不完整，已读取 {len(pages)} 条记录")
+    except (OSError, zlib.error) as e:
+        # 文件不存在、不是gzip或中间损坏，保留损坏前已读到的记录
+        print(f"⚠️ 归档文件读取失败({str(e)})，已读取 {len(pages)} 条记录")
+    return list(pages.items())
+
+
+def parallel_map(func, items, workers=None):
+    items = list(items)
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(func, items, chunksize=max(1, len(items) // 64)))
+    except (ImportError, NotImplementedError, OSError) as e:
+        # 部分Android/Termux环境缺少sem_open，退回单进程
+        print(f"⚠️ 多进程不可用({str(e)})，改为单进程解析")
+        return [func(item) for item in items]
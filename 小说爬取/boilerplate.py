@@ -0,0 +1,129 @@
+import json
+import os
+import re
+import unicodedata
+
+# 自动识别广告/防采集行：统计同一本书各章节中重复出现的行，
+# 出现在足够多章节里的行视为模板内容自动删除
+WHITESPACE = re.compile(r'\s+')
+DIGITS = re.compile(r'\d+')
+DOMAIN = re.compile(r'(?:https?://)?(?:[a-z0-9-]+\.)+[a-z]{2,}(?:/[a-z0-9_./?=&%#-]*)?')
+
+
+def normalize_line(line):
+    # 忽略空白和全半角差异；只有网址/域名中的数字视为相同，如 biquge5/biquge6 的镜像网址，
+    # 正文里只差数字的句子（时间是3点/时间是5点）仍算不同的行
+    line = unicodedata.normalize('NFKC', line).lower()
+    line = DOMAIN.sub(lambda m: DIGITS.sub('0', m.group()), line)
+    return WHITESPACE.sub('', line)
+
+
+class BoilerplateFilter:
+    def __init__(self, threshold=0.5, min_chapters=5, min_length=8, capacity=1024):
+        self.threshold = threshold
+        self.min_chapters = min_chapters
+        self.min_length = min_length
+        self.capacity = capacity
+        self.chapters = 0
+        # Misra-Gries频率统计：最多保留capacity个候选行，内存固定。
+        # 每轮淘汰让所有计数减一，所以计数最多少算decrements次；
+        # 判断时加回decrements，超过阈值的行不会漏掉（代价是略低于阈值的行也可能被删）
+        self.counters = {}
+        self.decrements = 0
+        self.samples = {}
+        self.known = set()
+        # 规则文件中 enabled 为 false 的行：人工确认不是广告，不删除也不再导出
+        self.rejected = set()
+
+    def observe(self, text):
+        self.chapters += 1
+        seen = set()
+        for line in text.split('\n'):
+            key = normalize_line(line)
+            if len(key) < self.min_length or key in seen:
+                continue
+            seen.add(key)
+            if key in self.counters:
+                self.counters[key] += 1
+            elif len(self.counters) < self.capacity:
+                self.counters[key] = 1
+                self.samples[key] = line.strip()
+            else:
+                self.decrements += 1
+                for k in list(self.counters):
+                    self.counters[k] -= 1
+                    if not self.counters[k]:
+                        del self.counters[k]
+                        del self.samples[k]
+
+    def is_boilerplate(self, key):
+        if key in self.rejected:
+            return False
+        if key in self.known:
+            return True
+        if self.chapters < self.min_chapters:
+            return False
+        return key in self.counters and self.estimate(key) >= self.threshold * self.chapters
+
+    def estimate(self, key):
+        # 出现章节数的上界
+        return min(self.counters[key] + self.decrements, self.chapters)
+
+    def strip(self, text):
+        lines = [line for line in text.split('\n')
+                 if not self.is_boilerplate(normalize_line(line))]
+        return re.sub(r'\n{3,}', '\n\n', '\n'.join(lines)).strip()
+
+    def feed(self, text):
+        self.observe(text)
+        return self.strip(text)
+
+    def learned(self):
+        return sorted(
+            [{'line': self.samples[k], 'normalized': k, 'chapters': self.estimate(k), 'enabled': True}
+             for k in self.counters if k not in self.known and self.is_boilerplate(k)],
+            key=lambda rule: -rule['chapters']
+        )
+
+    def read_rules(self, path):
+        if not os.path.exists(path):
+            return []
+        with open(path, 'r', encoding='utf-8') as f:
+            rules = json.load(f)
+        if not isinstance(rules, list):
+            raise TypeError("规则文件应为列表")
+        # 每条规则都要有line，同时检查格式
+        for rule in rules:
+            normalize_line(rule['line'])
+        return rules
+
+    def load_rules(self, path):
+        try:
+            rules = self.read_rules(path)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"⚠️ 清理规则读取失败 {path}: {str(e)}")
+            return
+        for rule in rules:
+            key = normalize_line(rule['line'])
+            (self.known if rule.get('enabled', True) else self.rejected).add(key)
+        if rules:
+            print(f"🧹 已加载 {len(rules)} 条自动清理规则: {path}")
+
+    def export_rules(self, path):
+        try:
+            rules = self.read_rules(path)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            # 手工编辑出错的规则文件不能覆盖，否则已有规则会丢失
+            print(f"⚠️ 清理规则读取失败，本次不导出新规则，请修正 {path}: {str(e)}")
+            return
+        existing = {normalize_line(rule['line']) for rule in rules}
+        added = [rule for rule in self.learned() if rule['normalized'] not in existing]
+        if not added:
+            return
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(rules + added, f, ensure_ascii=False, indent=2)
+            print(f"🧹 新增 {len(added)} 条自动清理规则，请检查: {path}")
+        except OSError as e:
+            print(f"⚠️ 清理规则导出失败 {path}: {str(e)}")
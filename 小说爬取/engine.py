@@ -0,0 +1,389 @@
+import requests
+import time
+import os
+import re
+import subprocess
+import json
+import uuid
+import argparse
+from collections import Counter
+from urllib.parse import urlparse
+from archive import ARCHIVE_NAME, RawArchive, book_key, load_pages, parallel_map
+from boilerplate import BoilerplateFilter
+from sites import get_adapter
+
+config = {
+    'headers': {
+        'User-Agent': 'Mozilla/5.0 (Linux; Android 13) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.6099.230 Mobile Safari/537.36',
+        'Accept': 'text/html,application/xhtml+xml;q=0.9,image/webp,*/*;q=0.8'
+    },
+    'save_path': '/storage/emulated/0/Download/novels',
+    'request_interval': 3,
+    'max_retries': 5,
+    'termux_notify': True,
+    'archive_raw': False,
+    'auto_clean': True,
+    'boilerplate_threshold': 0.5,
+    'boilerplate_min_chapters': 5
+}
+
+MERGE_ACTIONS = [
+    "🚀 合并后删除章节",
+    "💾 仅保存章节文件",
+    "📚 合并保留章节"
+]
+
+class NovelCrawler:
+    def __init__(self, start_url=None, merge_action=0):
+        self.start_url = start_url
+        self.adapter = None
+        self.session = requests.Session()
+        self.session.headers.update(config['headers'])
+        self.chapter_count = 0
+        self.novel_name = None
+        self.novel_dir = None
+        self.merge_action = merge_action  # 0:合并删除 1:仅保存 2:合并保留
+        self.archive = None
+        self.boilerplate = None
+        self.rules_path = None
+        self.cache = {}
+        self.stats = {'pages': 0, 'cached': 0, 'bytes': 0, 'fetch_time': 0.0, 'parse_time': 0.0}
+        os.makedirs(config['save_path'], exist_ok=True)
+        self.is_termux = 'com.termux' in os.getcwd()
+
+    def show_notification(self, title, message):
+        if self.is_termux and config['termux_notify']:
+            try:
+                subprocess.run([
+                    'termux-notification',
+                    '--title', title,
+                    '--content', message,
+                    '--led-color', 'FF00FF00'
+                ], check=True)
+            except (FileNotFoundError, subprocess.CalledProcessError) as e:
+                print(f"通知发送失败: {str(e)}")
+
+    def termux_dialog(self, dialog_type, title, values=None, default_input=""):
+        try:
+            cmd = ['termux-dialog']
+            if dialog_type == "text":
+                cmd += ['text', '-t', title, '-i', default_input]
+            elif dialog_type == "radio":
+                cmd += ['radio', '-v', ','.join(values), '-t', title]
+
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=45)
+            raw_output = result.stdout.strip()
+
+            # 增强JSON解析
+            try:
+                data = json.loads(raw_output)
+            except json.JSONDecodeError:
+                code_match = re.search(r'"code"\s*:\s*(-?\d+)', raw_output)
+                text_match = re.search(r'"text"\s*:\s*"?(.*?)"?[\},]', raw_output)
+                data = {
+                    "code": int(code_match.group(1)) if code_match else -2,
+                    "text": text_match.group(1).strip() if text_match else ""
+                }
+            return data if data.get('text') else None
+
+        except Exception as e:
+            print(f"对话框异常: {str(e)}")
+            return None
+
+    def get_user_input(self, default_url=""):
+        url_dialog = self.termux_dialog("text", "📖 请输入小说起始网址", default_input=default_url)
+        if not (url_dialog and url_dialog.get('text', '').strip()):
+            self.show_notification("输入取消", "未提供起始网址")
+            return False
+        self.start_url = url_dialog['text'].strip()
+
+        action_dialog = self.termux_dialog("radio", "🛠️ 请选择操作模式", values=MERGE_ACTIONS)
+        if action_dialog and action_dialog.get('text') in MERGE_ACTIONS:
+            self.merge_action = MERGE_ACTIONS.index(action_dialog['text'])
+        else:
+            print("使用默认合并模式")
+            self.merge_action = 0
+        return True
+
+    def open_archive(self):
+        archive_path = os.path.join(config['save_path'], ARCHIVE_NAME)
+        # 本书已归档的页面直接复用，中断后重新运行无需再次请求
+        if os.path.exists(archive_path):
+            self.cache = dict(load_pages(archive_path, book_key(self.start_url)))
+        self.archive = RawArchive(archive_path)
+
+    def get_page_content(self, url):
+        if url in self.cache:
+            self.stats['cached'] += 1
+            return self.cache.pop(url)
+
+        for retry in range(config['max_retries']):
+            start = time.time()
+            try:
+                response = self.session.get(url, timeout=15)
+                response.encoding = 'utf-8'
+                if response.status_code == 404:
+                    self.show_notification("章节不存在", f"URL: {url}")
+                    return None
+                response.raise_for_status()
+                self.stats['pages'] += 1
+                self.stats['bytes'] += len(response.content)
+                if self.archive:
+                    self.archive.write(url, response.text)
+                return response.text
+            except Exception as e:
+                print(f"请求失败({retry+1}/{config['max_retries']}): {str(e)}")
+                time.sleep(2)
+            finally:
+                self.stats['fetch_time'] += time.time() - start
+        return None
+
+    def parse_page(self, html, url):
+        start = time.time()
+        try:
+            return self.adapter.parse(html, url)
+        finally:
+            self.stats['parse_time'] += time.time() - start
+
+    def start_novel(self, novel_name, url):
+        self.novel_name = novel_name or f"无名小说_{uuid.uuid4().hex[:6]}"
+        self.novel_dir = os.path.join(config['save_path'], self.novel_name)
+        os.makedirs(self.novel_dir, exist_ok=True)
+        self.chapter_count = 0
+        if config['auto_clean']:
+            # 每本书单独统计，同一网站已学到的规则直接复用
+            self.boilerplate = BoilerplateFilter(config['boilerplate_threshold'],
+                                                 config['boilerplate_min_chapters'])
+            self.rules_path = os.path.join(config['save_path'], 'boilerplate_rules',
+                                           f"{urlparse(url).hostname}.json")
+            self.boilerplate.load_rules(self.rules_path)
+        self.show_notification("开始下载", f"《{self.novel_name}》")
+
+    def chapter_files(self):
+        return sorted(
+            [f for f in os.listdir(self.novel_dir) if re.match(r'^\d{4}_.*\.txt$', f)],
+            key=lambda x: int(x.split('_')[0])
+        )
+
+    def save_chapter(self, title, content):
+        self.chapter_count += 1
+        filename = os.path.join(self.novel_dir, f"{self.chapter_count:04d}_{title}.txt")
+        try:
+            with open(filename, 'w', encoding='utf-8') as f:
+                f.write(f"【{title}】\n\n{content}\n")
+            print(f"✅ 已保存: {filename}")
+        except PermissionError:
+            print("❌ 权限不足，请执行：termux-setup-storage")
+            self.show_notification("错误", "需要存储权限")
+            exit(1)
+
+    def merge_chapters(self):
+        chapter_files = self.chapter_files()
+        if not chapter_files:
+            print("⚠️ 没有可合并的章节")
+            return None
+
+        merged_path = os.path.join(self.novel_dir, f"{self.novel_name}.txt")
+        try:
+            with open(merged_path, 'w', encoding='utf-8') as mf:
+                for cf in chapter_files:
+                    with open(os.path.join(self.novel_dir, cf), 'r', encoding='utf-8') as sf:
+                        text = sf.read()
+                    # 前几章下载时统计还不充分，合并时按完整统计再清理一遍
+                    if self.boilerplate:
+                        header, _, body = text.partition('\n\n')
+                        text = f"{header}\n\n{self.boilerplate.strip(body)}\n"
+                    mf.write(text + '\n\n')
+            print(f"✅ 合并完成: {merged_path}")
+            self.show_notification("合并成功", os.path.basename(merged_path))
+            return merged_path
+        except Exception as e:
+            print(f"❌ 合并失败: {str(e)}")
+            self.show_notification("合并失败", str(e))
+            return None
+
+    def merge_and_clean(self):
+        if self.merge_action != 1 and self.merge_chapters() and self.merge_action == 0:
+            chapter_files = self.chapter_files()
+            for cf in chapter_files:
+                try:
+                    os.remove(os.path.join(self.novel_dir, cf))
+                except Exception as e:
+                    print(f"❌ 删除失败: {cf} - {str(e)}")
+            print(f"🗑️ 已清理 {len(chapter_files)} 个章节文件")
+        # 规则导出放在合并之后，导出出错也不影响合并结果
+        if self.boilerplate:
+            self.boilerplate.export_rules(self.rules_path)
+
+    def report(self, time_cost):
+        stats = self.stats
+        summary = (f"耗时: {time_cost:.1f}秒\n章节: {self.chapter_count}章\n"
+                   f"请求: {stats['pages']}页 {stats['bytes'] / 1024:.0f}KB，"
+                   f"缓存命中: {stats['cached']}页\n"
+                   f"网络: {stats['fetch_time']:.1f}秒，解析: {stats['parse_time']:.1f}秒")
+        print(f"📊 {summary}")
+        return summary
+
+    def download_all(self):
+        try:
+            self.adapter = get_adapter(self.start_url)
+        except ValueError as e:
+            print(f"❌ {str(e)}")
+            self.show_notification("URL错误", str(e))
+            return
+        if self.adapter.url_pattern and not self.adapter.url_pattern.match(self.start_url):
+            self.show_notification("URL错误", "无效的章节URL格式")
+            return
+        self.session.headers.update(self.adapter.headers)
+        interval = self.adapter.request_interval or config['request_interval']
+        if config['archive_raw']:
+            self.open_archive()
+
+        print(f"🏁 开始下载({self.adapter.name})，按Ctrl+C停止")
+        start_time = time.time()
+        url = self.start_url
+        try:
+            while url:
+                print(f"\n📡 抓取: {url}")
+                page_start = time.time()
+                cached = url in self.cache
+                html = self.get_page_content(url)
+                if not html:
+                    print("🚨 获取页面失败")
+                    break
+
+                try:
+                    data = self.parse_page(html, url)
+                    if cached and not data['next_url']:
+                        # 缓存的最后一页在归档时还没有下一章，重新请求看是否有更新
+                        print("🔄 重新请求缓存的最后一页，检查新章节")
+                        cached = False
+                        # 缓存的页面没有被采用，不计入缓存命中
+                        self.stats['cached'] -= 1
+                        if fresh := self.get_page_content(url):
+                            data = self.parse_page(fresh, url)
+                except Exception as e:
+                    print(f"❌ 解析错误: {str(e)}")
+                    self.show_notification("解析错误", str(e))
+                    break
+                if not self.novel_name:
+                    self.start_novel(data['novel_name'], url)
+                content = data['content']
+                if self.boilerplate:
+                    content = self.boilerplate.feed(content)
+                self.save_chapter(data['title'], content)
+                url = data['next_url']
+
+                # 解析耗时计入请求间隔
+                if url and not cached:
+                    time.sleep(max(0, interval - (time.time() - page_start)))
+
+            if self.novel_dir:
+                self.merge_and_clean()
+            self.show_notification("下载完成", self.report(time.time() - start_time))
+
+        except KeyboardInterrupt:
+            print("\n🛑 用户中断")
+            self.show_notification("下载中断", f"已保存 {self.chapter_count} 章")
+        finally:
+            if self.archive:
+                self.archive.close()
+
+    def merge_only(self, novel_name):
+        self.novel_name = novel_name
+        self.novel_dir = os.path.join(config['save_path'], novel_name)
+        if not os.path.isdir(self.novel_dir):
+            print(f"⚠️ 未找到小说目录: {self.novel_dir}")
+            return
+        self.merge_and_clean()
+
+    def reparse_archive(self, archive_path):
+        pages = load_pages(archive_path)
+        if not pages:
+            print("⚠️ 归档中没有页面")
+            return
+
+        start_time = time.time()
+        print(f"🔁 重新解析 {len(pages)} 个页面")
+        parsed = [(url, data) for (url, _), data in zip(pages, parallel_map(_reparse_page, pages)) if data]
+
+        # 只在单个页面上出现的书名不可靠（多半是误取的章节名），
+        # 改用同一目录下最常见的可靠书名，没有则用该目录第一页的书名，仍没有则按目录单独成书
+        names = Counter(data['novel_name'] for _, data in parsed if data['novel_name'])
+        dir_names = {}
+        for url, data in parsed:
+            if data['novel_name']:
+                counter = dir_names.setdefault(book_key(url), Counter())
+                if names[data['novel_name']] > 1:
+                    counter[data['novel_name']] += 1
+                elif not counter:
+                    counter[data['novel_name']] = 0
+
+        # 同一本书可能多次追加到归档中，按书名分组并保持首次出现的顺序
+        books = {}
+        for url, data in parsed:
+            if names[data['novel_name']] > 1:
+                key = data['novel_name']
+            elif book_key(url) in dir_names:
+                key = dir_names[book_key(url)].most_common(1)[0][0]
+            else:
+                key = book_key(url)
+            books.setdefault(key, (url, []))[1].append(data)
+
+        for key, (url, chapters) in books.items():
+            self.start_novel(key if isinstance(key, str) else None, url)
+            # 旧章节文件编号可能与重新解析的结果错位，先清理
+            for cf in self.chapter_files():
+                os.remove(os.path.join(self.novel_dir, cf))
+            # 所有章节都已在手，先完整统计再清理
+            if self.boilerplate:
+                for data in chapters:
+                    self.boilerplate.observe(data['content'])
+            for data in chapters:
+                content = data['content']
+                if self.boilerplate:
+                    content = self.boilerplate.strip(content)
+                self.save_chapter(data['title'], content)
+            self.merge_and_clean()
+        print(f"🎉 重新解析完成，耗时 {time.time() - start_time:.1f}秒")
+
+def _reparse_page(page):
+    url, html = page
+    try:
+        return get_adapter(url).parse(html, url)
+    except Exception as e:
+        print(f"❌ 解析错误 {url}: {str(e)}")
+        return None
+
+def main(default_url=""):
+    parser = argparse.ArgumentParser(description='Termux小说下载工具')
+    parser.add_argument('url', nargs='?', help='小说起始章节的URL（--merge-only时为小说名）')
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--download-only', action='store_true', help='仅下载章节不合并')
+    group.add_argument('--keep-chapters', action='store_true', help='合并后保留章节文件')
+    group.add_argument('--merge-only', action='store_true', help='仅合并已下载章节')
+    parser.add_argument('--archive', action='store_true', help='同时保存原始网页到压缩归档')
+    parser.add_argument('--reparse', metavar='ARCHIVE', nargs='?', const='',
+                        help='离线重新解析归档文件并重新生成章节，默认为保存目录下的归档')
+    args = parser.parse_args()
+    if args.archive:
+        config['archive_raw'] = True
+
+    merge_action = 1 if args.download_only else 2 if args.keep_chapters else 0
+    crawler = NovelCrawler(args.url, merge_action)
+    if args.reparse is not None:
+        crawler.reparse_archive(args.reparse or os.path.join(config['save_path'], ARCHIVE_NAME))
+    elif args.merge_only:
+        if not args.url:
+            parser.error("仅合并模式需要提供小说名")
+        crawler.merge_only(args.url)
+    elif args.url:
+        crawler.download_all()
+    elif crawler.is_termux:
+        if crawler.get_user_input(default_url):
+            crawler.download_all()
+    else:
+        parser.print_help()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,240 @@
+import re
+from html import unescape
+from urllib.parse import urljoin, urlparse
+
+from lxml import etree, html as lxml_html
+
+# 站点规则：新增网站只需在这里加一条，启动时统一编译为XPath/正则提取器
+#   hosts      域名正则，按URL的host选择站点
+#   title      章节标题：xpath取文本(可给出多个，取第一个有结果的)，split分隔后取第index段，pattern提取“第X章”
+#   novel_name 书名：依次尝试patterns，都不匹配时为None；可给出多组xpath/patterns按顺序尝试
+#   content    正文：mode为text(去掉drop中的标签后取全部文本)、
+#              paragraphs(逐个<p>)或blocks(按sort_by属性排序的块)
+#   next       下一页链接策略，按顺序尝试：link取<a>的href，script从脚本变量中提取
+#   clean      广告清理正则(模式, 替换)，normalize_lines为True时按行去空白后以空行分隔
+SITE_RULES = [
+    {
+        'name': '笔趣阁',
+        'hosts': [r'(^|\.)biquguaxs\.com$', r'(^|\.)biquge\d*\.com$'],
+        'request_interval': 2,
+        'title': {'xpath': ['//h1', '//title'], 'split': '-', 'index': 0,
+                  'pattern': r'^.*?(第[^章]+章)'},
+        'novel_name': [
+            {'xpath': '//h1', 'patterns': [r'(.*?)最新章节', r'(.*?)\s*-\s*', r'最新章：(.*?)\s*\|']},
+            # <title>形如“第1章 风起 - 书名 - 笔趣阁”，书名在中间一段
+            {'xpath': '//title', 'patterns': [r'(.*?)最新章节', r'-\s*(.*?)\s*-', r'最新章：(.*?)\s*\|']},
+        ],
+        'content': {'xpath': "//div[@id='novelcontent']", 'mode': 'text',
+                    'drop': ['script', 'font', 'div', 'a']},
+        'next': [
+            {'type': 'link', 'xpath': "//div[contains(@class, 'page_chapter')]//a",
+             'text': r'下一頁|下一页|下一章'},
+        ],
+        'clean': [
+            (r'&nbsp;|\u3000', ' '),
+            (r'内容未完[^\n]+', ''),
+            (r'还不赶快来体验！+', ''),
+            (r'请收藏本站：https://www\.biquge\d+\.com。\s*笔趣阁手机版：https://m\.biquge\d+\.com', ''),
+        ],
+        'normalize_lines': True,
+    },
+    {
+        'name': '格格党',
+        'hosts': [r'(^|\.)ggdwx\.net$'],
+        'url_pattern': r'^https?://m\.ggdwx\.net/book/\d+/\d+\.html$',
+        'headers': {'Referer': 'http://m.ggdwx.net/', 'Accept-Encoding': 'gzip, deflate'},
+        'request_interval': 3,
+        'title': {'xpath': '//title', 'split': '_', 'index': 1,
+                  'pattern': r'^.*?(第[^章]+章)'},
+        'novel_name': {'xpath': '//title', 'patterns': [r'^(.*?)_', r'^(.*?)最新']},
+        'content': {'xpath': "//div[@id='txt']", 'mode': 'blocks',
+                    'blocks': './/dd[@data-id]', 'sort_by': 'data-id'},
+        'next': [
+            {'type': 'script', 'xpath': "//script[contains(., 'var next_page')]",
+             'pattern': r'var\s+next_page\s*=\s*["\'](.*?)["\'];'},
+            {'type': 'link', 'xpath': "//span[contains(@class, 'c67da7064a45a9')]//a"},
+        ],
+        'clean': [
+            (r'&nbsp;|\u3000', ' '),
+            (r'[\s\n]*「如章节缺失请退#出#阅#读#模#式」[\s\n]*', ''),
+            (r'[\s\n]*防采集.*?格格党.*?[\s\n]*', ''),
+            (r'内容未完[^\n]+', ''),
+            (r'\n{3,}', '\n\n'),
+        ],
+        'ignore_case': True,
+    },
+    {
+        'name': 'ssbiqu',
+        'hosts': [r'(^|\.)ssbiqu\.cc$'],
+        'request_interval': 3,
+        'title': {'xpath': '//title', 'split': '_', 'index': 0},
+        'novel_name': {'xpath': '//title', 'patterns': [r'_(.*?)(?:_|$)']},
+        'content': {'xpath': "//div[@id='chaptercontent']", 'mode': 'paragraphs',
+                    'skip_prefix': '<!--'},
+        'next': [
+            {'type': 'link', 'xpath': "//a[@id='pt_next']", 'exclude': '没有了'},
+        ],
+        'clean': [],
+    },
+]
+
+
+def compile_xpaths(expr):
+    return [etree.XPath(e) for e in ([expr] if isinstance(expr, str) else expr)]
+
+
+def iter_text(element, drop):
+    # 逐段产出文本，跳过drop中的标签但保留其后的文本，与BeautifulSoup的decompose+get_text一致
+    if element.text:
+        yield element.text
+    for child in element:
+        if isinstance(child.tag, str) and child.tag not in drop:
+            yield from iter_text(child, drop)
+        if child.tail:
+            yield child.tail
+
+
+def sanitize_filename(name):
+    return re.sub(r'[\\/:*?"<>|]', '', name).strip()[:80]
+
+
+class SiteAdapter:
+    def __init__(self, rule):
+        self.name = rule['name']
+        self.hosts = [re.compile(h) for h in rule['hosts']]
+        self.url_pattern = re.compile(rule['url_pattern']) if rule.get('url_pattern') else None
+        self.headers = rule.get('headers', {})
+        self.request_interval = rule.get('request_interval')
+
+        title = rule['title']
+        self.title_xpath = compile_xpaths(title['xpath'])
+        self.title_split = title.get('split')
+        self.title_index = title.get('index', 0)
+        self.title_pattern = re.compile(title['pattern']) if title.get('pattern') else None
+
+        names = rule['novel_name'] if isinstance(rule['novel_name'], list) else [rule['novel_name']]
+        self.name_sources = [(compile_xpaths(name['xpath']), [re.compile(p) for p in name['patterns']])
+                             for name in names]
+
+        content = rule['content']
+        self.content_xpath = etree.XPath(content['xpath'])
+        self.content_mode = content['mode']
+        self.drop = frozenset(content.get('drop', []))
+        self.p_xpath = etree.XPath('.//p')
+        self.skip_prefix = content.get('skip_prefix')
+        self.blocks_xpath = etree.XPath(content['blocks']) if content.get('blocks') else None
+        self.sort_by = content.get('sort_by')
+
+        self.next_rules = []
+        for strategy in rule['next']:
+            self.next_rules.append({
+                'type': strategy['type'],
+                'xpath': etree.XPath(strategy['xpath']),
+                'text': re.compile(strategy['text']) if strategy.get('text') else None,
+                'pattern': re.compile(strategy['pattern']) if strategy.get('pattern') else None,
+                'exclude': strategy.get('exclude'),
+            })
+
+        flags = re.IGNORECASE if rule.get('ignore_case') else 0
+        self.clean_rules = [(re.compile(p, flags), repl) for p, repl in rule['clean']]
+        self.normalize_lines = rule.get('normalize_lines', False)
+
+    def matches(self, host):
+        return any(h.search(host) for h in self.hosts)
+
+    def first_text(self, xpaths, tree):
+        for xpath in xpaths:
+            nodes = xpath(tree)
+            if nodes:
+                return nodes[0].text_content().strip()
+        return ""
+
+    def extract_title(self, tree):
+        text = self.first_text(self.title_xpath, tree) or "未知章节"
+        if self.title_split:
+            parts = [p.strip() for p in text.split(self.title_split) if p.strip()] or [text]
+            text = parts[min(self.title_index, len(parts) - 1)]
+        if self.title_pattern:
+            text = self.title_pattern.sub(r'\1', text)
+        return sanitize_filename(text)
+
+    def extract_novel_name(self, tree):
+        for xpaths, patterns in self.name_sources:
+            text = self.first_text(xpaths, tree)
+            for pattern in patterns:
+                match = pattern.search(text)
+                if match and sanitize_filename(match.group(1)):
+                    return sanitize_filename(match.group(1))
+        return None
+
+    def extract_content(self, tree):
+        nodes = self.content_xpath(tree)
+        if not nodes:
+            raise ValueError("未找到章节内容")
+        div = nodes[0]
+
+        if self.content_mode == 'text':
+            return '\n'.join(iter_text(div, self.drop))
+
+        if self.content_mode == 'paragraphs':
+            paragraphs = []
+            for p in self.p_xpath(div):
+                text = p.text_content().strip()
+                if text and not (self.skip_prefix and text.startswith(self.skip_prefix)):
+                    paragraphs.append(text)
+            return '\n\n'.join(paragraphs)
+
+        # blocks: 处理动态排序的块元素
+        blocks = sorted(self.blocks_xpath(div), key=lambda b: int(b.get(self.sort_by)))
+        parts = []
+        for block in blocks:
+            paragraphs = self.p_xpath(block)
+            parts.extend([p.text_content().strip() for p in paragraphs] if paragraphs
+                         else [block.text_content().strip()])
+        return '\n\n'.join(parts)
+
+    def extract_next_url(self, tree, url):
+        for strategy in self.next_rules:
+            for node in strategy['xpath'](tree):
+                if strategy['type'] == 'script':
+                    match = strategy['pattern'].search(node.text_content())
+                    href = match.group(1) if match else None
+                else:
+                    text = node.text_content()
+                    if strategy['text'] and not strategy['text'].search(text):
+                        continue
+                    if strategy['exclude'] and strategy['exclude'] in text:
+                        continue
+                    href = node.get('href')
+                if href:
+                    next_url = urljoin(url, href)
+                    return next_url if next_url != url else None
+        return None
+
+    def clean_content(self, text):
+        text = unescape(text)
+        for pattern, repl in self.clean_rules:
+            text = pattern.sub(repl, text)
+        if self.normalize_lines:
+            return '\n\n'.join([line.strip() for line in text.split('\n') if line.strip()])
+        return text.strip()
+
+    def parse(self, html, url):
+        tree = lxml_html.document_fromstring(html)
+        return {
+            'title': self.extract_title(tree),
+            'novel_name': self.extract_novel_name(tree),
+            'content': self.clean_content(self.extract_content(tree)),
+            'next_url': self.extract_next_url(tree, url),
+        }
+
+
+ADAPTERS = [SiteAdapter(rule) for rule in SITE_RULES]
+
+
+def get_adapter(url):
+    host = urlparse(url).hostname or ''
+    for adapter in ADAPTERS:
+        if adapter.matches(host):
+            return adapter
+    raise ValueError(f"不支持的网站: {host}")